@@ -1,6 +1,16 @@
+import collections
+import functools
 import math
+import os
 import sys
+import threading
+
+# Route per-pixel alpha blits through SDL2's blitter, which is much faster
+# than pygame's own on ARM. Must be set before pygame is imported.
+os.environ['PYGAME_BLEND_ALPHA_SDL2'] = '1'
+
 import pygame
+import pygame.gfxdraw
 import serial
 import serial.tools.list_ports
 
@@ -9,10 +19,16 @@ import serial.tools.list_ports
 # ---------------------------
 PORT = "/dev/ttyACM0"      # Change if needed
 BAUDRATE = 9600
+MAX_MESSAGE_BYTES = 64  # Longest "angle,distance." line we expect
 
 # 3.5 inch Raspberry Pi display resolution
 WIDTH, HEIGHT = 480, 320
-FPS = 30  # Lower FPS for RPi performance
+# The sketch sends one reading per degree (~40-60 Hz), so at 15 FPS the
+# sweep line steps 3-4 degrees per frame; traded for roughly half the CPU
+FPS = 15
+IDLE_REDRAW_FRAMES = FPS  # Repaint at least this often with no new data
+# Past this many changed pixels a single full copy beats per-rect updates
+PARTIAL_UPDATE_MAX_AREA = WIDTH * HEIGHT // 2
 
 # Colors (RGB)
 GREEN = (0, 255, 0)
@@ -22,17 +38,45 @@ RED = (255, 60, 60)
 BLACK = (0, 0, 0)
 BG_COLOR = (10, 10, 10)
 
+# Sweep trail: previous angles drawn in progressively darker greens
+# (stands in for the old per-pixel-alpha fade)
+TRAIL_LENGTH = 6
+TRAIL_COLORS = [
+    tuple(b + (g - b) * (TRAIL_LENGTH - age) // (TRAIL_LENGTH + 1)
+          for g, b in zip(GREEN_LINE, BG_COLOR))
+    for age in range(TRAIL_LENGTH)
+]
+
 # Radar center for 3.5" display
 RADAR_CX = 240  # Center horizontally
 RADAR_CY = 210  # Position for 180° display
 RADAR_RADIUS = 200  # Maximum radar range
+RADAR_ARC_RADII = (900, 700, 500, 300)  # Range arcs, baked into the background
+
+# Trig lookup tables for the integer 0-180 degree sweep
+COS = [math.cos(math.radians(d)) for d in range(181)]
+SIN = [math.sin(math.radians(d)) for d in range(181)]
+
+# Screen-space sweep line endpoints for every integer angle
+RADAR_CENTER = (RADAR_CX, RADAR_CY)
+SWEEP_END = [
+    (int(RADAR_CX + RADAR_RADIUS * COS[d]), int(RADAR_CY - RADAR_RADIUS * SIN[d]))
+    for d in range(181)
+]
+
+# Screen-space object positions keyed by (angle, distance), filled lazily
+OBJ_INNER = {}
+
+# Screen-space guide line endpoints at 30, 60, 90, 120, 150 degrees
+GUIDE_END = [SWEEP_END[d] for d in (30, 60, 90, 120, 150)]
 
 # ---------------------------
 # SERIAL SETUP
 # ---------------------------
 def open_serial(port, baudrate):
     try:
-        ser = serial.Serial(port, baudrate, timeout=0.01)
+        # Blocking reads: the serial thread waits in read_until for each message
+        ser = serial.Serial(port, baudrate, timeout=None)
         return ser
     except serial.SerialException as e:
         print(f"Serial error: {e}")
@@ -40,128 +84,204 @@ def open_serial(port, baudrate):
 
 ser = open_serial(PORT, BAUDRATE)
 
-# Buffer for accumulating serial text
-serial_buffer = ""
+# Latest (angle, distance) parsed by the serial thread. Replaced with a
+# single tuple assignment, so the main loop can read it without a lock.
+latest_reading = (0, 0)
 
 # These replicate your Processing variables
 angle_str = ""
 distance_str = ""
 data_str = ""
 no_object = ""
-pix_distance = 0.0
 i_angle = 0
 i_distance = 0
 
+# Set whenever the displayed values change; the main loop only repaints when set
+dirty = True
+
+# Most recent sweep angles, newest last (current angle included)
+sweep_trail = collections.deque(maxlen=TRAIL_LENGTH + 1)
+
 # ---------------------------
 # PYGAME SETUP
 # ---------------------------
 pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+# SCALED gives an SDL renderer/texture-backed display, so presenting a
+# frame goes through the GPU instead of a CPU-side software copy. The
+# renderer always presents the whole texture (display.update(rects) acts
+# like flip()), so dirty-rect updates only pay off on a software display.
+partial_updates = False
+try:
+    screen = pygame.display.set_mode(
+        (WIDTH, HEIGHT), pygame.SCALED | pygame.DOUBLEBUF, vsync=1
+    )
+except pygame.error:
+    try:
+        # Some drivers cannot provide vsync; keep the texture-backed display
+        screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.SCALED | pygame.DOUBLEBUF)
+    except pygame.error:
+        # No renderer at all: plain software display, present dirty rects
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        partial_updates = True
 pygame.display.set_caption("Radar - Pygame Version")
 clock = pygame.time.Clock()
 
 # Fonts optimized for 3.5" screen
+# Each SysFont holds an open TTF file, so create them here once and never
+# inside the loop; per-frame text comes from the render caches below
 font_small = pygame.font.SysFont("consolas", 10)
 font_medium = pygame.font.SysFont("consolas", 12)
-font_large = pygame.font.SysFont("consolas", 14)
 
-# A separate surface to simulate the fade / motion blur
+# A separate opaque surface in the display format
 # We draw radar stuff on this surface, then blit to the screen
-radar_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-radar_surface.fill((*BG_COLOR, 255))  # dark background
+radar_surface = pygame.Surface((WIDTH, HEIGHT)).convert()
+radar_surface.fill(BG_COLOR)  # dark background
+
+# pygame-ce exposes Surface.fblits, a faster blits without return rects
+HAS_FBLITS = hasattr(pygame.Surface, "fblits")
 
 
 # ---------------------------
 # UTILITY FUNCTIONS
 # ---------------------------
 
-def processing_to_screen(x_local, y_local):
+@functools.lru_cache(maxsize=512)
+def render_small(text, color):
+    """
+    Render text with font_small, cached by (text, color). The angle and
+    distance readouts only take a few hundred distinct values, so after
+    warm-up no frame pays for font rendering.
+    """
+    return font_small.render(text, True, color).convert_alpha()
+
+@functools.lru_cache(maxsize=181)
+def render_angle(angle):
+    """Angle readout keyed on the int, so the hot path skips formatting."""
+    return render_small(f"A:{angle:03d}°", GREEN_TEXT)
+
+@functools.lru_cache(maxsize=41)
+def render_distance(distance):
+    """Distance readout for an in-range object, keyed on the int."""
+    return render_small(f"D:{distance}cm", RED)
+
+def prewarm_text_cache():
+    for angle in range(0, 181):
+        render_angle(angle)
+    for distance in range(0, 41):
+        render_distance(distance)
+    render_small("D:---", GREEN_TEXT)
+    render_small("In", RED)
+    render_small("Out", GREEN_TEXT)
+
+def build_radar_bg():
     """
-    Convert Processing-like coordinates (0,0 at radar center,
-    positive y up) to Pygame screen coordinates (0,0 top-left,
-    positive y down).
+    Render the static radar grid (arcs, axis, guide lines, title, scale
+    labels and the empty status bar) once into an opaque surface. Each
+    frame resets radar_surface by blitting this instead of redrawing the
+    primitives.
     """
-    # Processing radar local: (0,0) at center, y up
-    # We want: (RADAR_CX, RADAR_CY) is that center, y down.
-    x_screen = RADAR_CX + x_local
-    y_screen = RADAR_CY - y_local
-    return (int(x_screen), int(y_screen))
+    surface = pygame.Surface((WIDTH, HEIGHT)).convert()
+    surface.fill(BG_COLOR)
 
-def draw_radar(surface):
     # Arcs: Processing arcs were:
     # arc(0,0,1800,1800,PI,TWO_PI); etc.
     # That’s radius 900, 700, 500, 300
-    pygame.draw.arc(
-        surface, GREEN,
-        (RADAR_CX - 900, RADAR_CY - 900, 1800, 1800),
-        math.pi, 2 * math.pi, 2
-    )
-    pygame.draw.arc(
-        surface, GREEN,
-        (RADAR_CX - 700, RADAR_CY - 700, 1400, 1400),
-        math.pi, 2 * math.pi, 2
-    )
-    pygame.draw.arc(
-        surface, GREEN,
-        (RADAR_CX - 500, RADAR_CY - 500, 1000, 1000),
-        math.pi, 2 * math.pi, 2
-    )
-    pygame.draw.arc(
-        surface, GREEN,
-        (RADAR_CX - 300, RADAR_CY - 300, 600, 600),
-        math.pi, 2 * math.pi, 2
-    )
+    # gfxdraw angles are in degrees, clockwise on screen, so 0-180 covers
+    # the same span draw.arc did for PI..TWO_PI; two passes give a 2px stroke
+    for radius in RADAR_ARC_RADII:
+        for r in (radius, radius - 1):
+            pygame.gfxdraw.arc(surface, RADAR_CX, RADAR_CY, r, 0, 180, GREEN)
 
     # Horizontal axis (0-180 degree line)
-    start = processing_to_screen(-RADAR_RADIUS, 0)
-    end = processing_to_screen(RADAR_RADIUS, 0)
+    start = (RADAR_CX - RADAR_RADIUS, RADAR_CY)
+    end = (RADAR_CX + RADAR_RADIUS, RADAR_CY)
     pygame.draw.line(surface, GREEN, start, end, 1)
 
     # Angle guide lines at 30, 60, 90, 120, 150 degrees
-    for deg in (30, 60, 90, 120, 150):
-        rad = math.radians(deg)
-        x = RADAR_RADIUS * math.cos(rad)
-        y = RADAR_RADIUS * math.sin(rad)
-        start = processing_to_screen(0, 0)
-        end = processing_to_screen(x, y)
-        pygame.draw.line(surface, GREEN, start, end, 1)
+    for end in GUIDE_END:
+        pygame.draw.line(surface, GREEN, RADAR_CENTER, end, 1)
+
+    # Distance scale labels - only show key distances
+    scale_y = RADAR_CY + 5
+    for dist_cm in [10, 20, 30, 40]:
+        x_pos = RADAR_CX + (dist_cm * 5)  # 5 pixels per cm
+        if x_pos < WIDTH - 20:  # Only draw if within screen
+            txt = render_small(f"{dist_cm}", GREEN_TEXT)
+            surface.blit(txt, (x_pos - 5, scale_y))
+            pygame.draw.line(surface, GREEN, (x_pos, RADAR_CY - 3), (x_pos, RADAR_CY + 3), 1)
+
+    # Degree labels - only key angles
+    for deg in [0, 45, 90, 135, 180]:
+        label_dist = RADAR_RADIUS + 15
+        screen_pos = (int(RADAR_CX + label_dist * COS[deg]),
+                      int(RADAR_CY - label_dist * SIN[deg]))
+
+        text_surface = render_small(f"{deg}", GREEN_LINE)
+        text_rect = text_surface.get_rect(center=screen_pos)
+        surface.blit(text_surface, text_rect)
+
+    # Compact title
+    txt_title = font_medium.render("RADAR", True, GREEN_LINE)
+    surface.blit(txt_title, (5, 5))
+
+    # Bottom status bar
+    pygame.draw.rect(surface, BLACK, (0, 235, WIDTH, HEIGHT - 235))
+    pygame.draw.line(surface, GREEN, (0, 235), (WIDTH, 235), 1)
+
+    return surface
+
+
+def object_position(angle, distance):
+    """
+    Screen position of an object `distance` cm away at `angle` degrees,
+    computed on first use and then served from OBJ_INNER.
+    """
+    key = (angle, distance)
+    pos = OBJ_INNER.get(key)
+    if pos is None:
+        pix_distance = distance * 5  # Scale factor for 3.5" display (200px/40cm = 5)
+        pos = (int(RADAR_CX + pix_distance * COS[angle]),
+               int(RADAR_CY - pix_distance * SIN[angle]))
+        OBJ_INNER[key] = pos
+    return pos
 
 
 def draw_object(surface):
-    global pix_distance, i_angle, i_distance
+    """Draw the detected object, if any, and return the rects touched."""
+    global i_angle, i_distance
+    rects = []
     # Only if distance < 40 cm
     if i_distance < 40:
-        pix_distance = i_distance * 5  # Scale factor for 3.5" display (200px/40cm = 5)
-        rad = math.radians(i_angle)
-
         # Draw red line from detected object to edge
-        x1 = pix_distance * math.cos(rad)
-        y1 = pix_distance * math.sin(rad)
-        x2 = RADAR_RADIUS * math.cos(rad)
-        y2 = RADAR_RADIUS * math.sin(rad)
-
-        start = processing_to_screen(x1, y1)
-        end = processing_to_screen(x2, y2)
-        pygame.draw.line(surface, RED, start, end, 3)
-        
+        obj_pos = object_position(i_angle, i_distance)
+        end = SWEEP_END[i_angle]
+        rects.append(pygame.draw.line(surface, RED, obj_pos, end, 3))
+
         # Draw a circle at the detected object position
-        obj_pos = processing_to_screen(x1, y1)
-        pygame.draw.circle(surface, RED, obj_pos, 3)
+        rects.append(pygame.draw.circle(surface, RED, obj_pos, 3))
+    return rects
 
 
 def draw_line(surface):
+    """Draw the sweep line and its trail and return the rects touched."""
     global i_angle
-    # Sweep line showing current scanning angle
-    rad = math.radians(i_angle)
-    x2 = RADAR_RADIUS * math.cos(rad)
-    y2 = RADAR_RADIUS * math.sin(rad)
+    rects = []
+    if not sweep_trail or sweep_trail[-1] != i_angle:
+        sweep_trail.append(i_angle)
 
-    start = processing_to_screen(0, 0)
-    end = processing_to_screen(x2, y2)
-    pygame.draw.line(surface, GREEN_LINE, start, end, 2)
+    # Fading trail, oldest first so newer lines draw on top
+    newest = len(sweep_trail) - 1
+    for age in range(newest, 0, -1):
+        end = SWEEP_END[sweep_trail[newest - age]]
+        rects.append(pygame.draw.line(surface, TRAIL_COLORS[age - 1], RADAR_CENTER, end, 1))
+
+    # Sweep line showing current scanning angle
+    rects.append(pygame.draw.line(surface, GREEN_LINE, RADAR_CENTER, SWEEP_END[i_angle], 2))
+    return rects
 
 
 def draw_text(surface):
+    """Draw the status readouts and return the rects touched."""
     global i_distance, i_angle, no_object
 
     if i_distance > 40:
@@ -169,116 +289,147 @@ def draw_text(surface):
     else:
         no_object = "In"
 
-    # Bottom status bar
-    pygame.draw.rect(surface, BLACK, (0, 235, WIDTH, HEIGHT - 235))
-    pygame.draw.line(surface, GREEN, (0, 235), (WIDTH, 235), 1)
-
-    # Distance scale labels - only show key distances
-    scale_y = RADAR_CY + 5
-    for dist_cm in [10, 20, 30, 40]:
-        x_pos = RADAR_CX + (dist_cm * 5)  # 5 pixels per cm
-        if x_pos < WIDTH - 20:  # Only draw if within screen
-            txt = font_small.render(f"{dist_cm}", True, GREEN_TEXT)
-            surface.blit(txt, (x_pos - 5, scale_y))
-            pygame.draw.line(surface, GREEN, (x_pos, RADAR_CY - 3), (x_pos, RADAR_CY + 3), 1)
-
-    # Compact title
-    txt_title = font_medium.render("RADAR", True, GREEN_LINE)
-    surface.blit(txt_title, (5, 5))
-    
     # Status info - compact layout
     info_y = 240
-    txt_status = font_small.render(f"{no_object}", True, GREEN_TEXT if i_distance > 40 else RED)
-    txt_ang = font_small.render(f"A:{i_angle:03d}°", True, GREEN_TEXT)
-    
-    surface.blit(txt_status, (5, info_y))
-    surface.blit(txt_ang, (5, info_y + 15))
+    txt_status = render_small(no_object, GREEN_TEXT if i_distance > 40 else RED)
+    txt_ang = render_angle(i_angle)
 
     if i_distance < 40:
-        txt_dist = font_small.render(f"D:{i_distance}cm", True, RED)
+        txt_dist = render_distance(i_distance)
     else:
-        txt_dist = font_small.render("D:---", True, GREEN_TEXT)
-    surface.blit(txt_dist, (5, info_y + 30))
-
-    # Degree labels - only key angles
-    for deg in [0, 45, 90, 135, 180]:
-        rad = math.radians(deg)
-        label_dist = RADAR_RADIUS + 15
-        x = label_dist * math.cos(rad)
-        y = label_dist * math.sin(rad)
-        screen_pos = processing_to_screen(x, y)
-        
-        text_surface = font_small.render(f"{deg}", True, GREEN_LINE)
-        text_rect = text_surface.get_rect(center=screen_pos)
-        surface.blit(text_surface, text_rect)
+        txt_dist = render_small("D:---", GREEN_TEXT)
+
+    # Batch the blits into one C call (fblits is pygame-ce, blits is pygame)
+    draws = [
+        (txt_status, (5, info_y)),
+        (txt_ang, (5, info_y + 15)),
+        (txt_dist, (5, info_y + 30)),
+    ]
+    if HAS_FBLITS:
+        surface.fblits(draws)
+    else:
+        surface.blits(draws, doreturn=False)
+    return [pygame.Rect(pos, txt.get_size()) for txt, pos in draws]
 
 
-def read_serial():
+def merge_rects(rects):
+    """
+    Collapse overlapping rects into their unions so no pixel is copied
+    twice. The sweep and trail lines all start at the radar center, so
+    their bounding boxes overlap heavily and usually merge into one.
+    """
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+        hit = rect.collidelist(merged)
+        while hit != -1:
+            rect.union_ip(merged.pop(hit))
+            hit = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+def serial_worker():
     """
     Rough equivalent of Processing's serialEvent: reads until '.' and
-    parses "angle,distance." into i_angle and i_distance.
+    parses "angle,distance." into latest_reading. Runs on a daemon
+    thread so a stalled serial link never stalls a frame.
     """
-    global ser, serial_buffer, angle_str, distance_str, data_str, i_angle, i_distance
+    global angle_str, distance_str, data_str, latest_reading
 
-    if ser is None or not ser.is_open:
-        return
-
-    try:
-        bytes_available = ser.in_waiting
-    except OSError:
-        return
-
-    if bytes_available > 0:
+    resync = False
+    while ser.is_open:
         try:
-            chunk = ser.read(bytes_available).decode("utf-8", errors="ignore")
-        except UnicodeDecodeError:
+            raw = ser.read_until(b'.', size=MAX_MESSAGE_BYTES)
+        except (OSError, serial.SerialException):
             return
 
-        serial_buffer += chunk
-
-        # Process all complete messages ending with '.'
-        while '.' in serial_buffer:
-            msg, serial_buffer = serial_buffer.split('.', 1)
-            # msg should be "angle,distance"
-            if ',' in msg:
-                angle_str, distance_str = msg.split(',', 1)
-                try:
-                    i_angle = int(angle_str.strip())
-                    i_distance = int(distance_str.strip())
-                except ValueError:
-                    pass
+        # Without a terminator the size cap was hit on garbage, which may
+        # have cut a message in half; drop everything through the next '.'
+        # so that message's tail is not parsed as a reading
+        if not raw.endswith(b'.'):
+            resync = True
+            continue
+        if resync:
+            resync = False
+            continue
+
+        # msg should be "angle,distance"
+        msg = raw[:-1].decode("ascii", errors="ignore")
+        if ',' in msg:
+            angle_str, distance_str = msg.split(',', 1)
+            try:
+                angle = int(angle_str.strip())
+                distance = int(distance_str.strip())
+            except ValueError:
+                continue
+            # Angles index the trig tables, so drop anything off the sweep
+            if 0 <= angle <= 180:
+                latest_reading = (angle, distance)
 
 
 # ---------------------------
 # MAIN LOOP
 # ---------------------------
+prewarm_text_cache()
+radar_bg = build_radar_bg()
+
+if ser is not None:
+    threading.Thread(target=serial_worker, daemon=True).start()
+
 running = True
+idle_frames = 0
+full_redraw = True  # First frame (and expose events) push the whole screen
+prev_rects = []
 while running:
     dt = clock.tick(FPS)
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
-
-    # Read serial data
-    read_serial()
-
-    # Simulate motion blur with fade effect
-    fade_rect = pygame.Surface((WIDTH, 235), pygame.SRCALPHA)
-    fade_rect.fill((*BG_COLOR, 10))  # Low alpha for smooth fade trail
-    radar_surface.blit(fade_rect, (0, 0))
-
-    # Draw radar, line, object, text on radar_surface
-    draw_radar(radar_surface)
-    draw_line(radar_surface)
-    draw_object(radar_surface)
-    draw_text(radar_surface)
-
-    # Blit full radar_surface to main screen
-    screen.blit(radar_surface, (0, 0))
-
-    # Flip display
-    pygame.display.flip()
+        elif event.type == pygame.VIDEOEXPOSE:
+            dirty = True
+            full_redraw = True
+
+    # Pick up the latest reading from the serial thread
+    angle, distance = latest_reading
+    if angle != i_angle or distance != i_distance:
+        i_angle, i_distance = angle, distance
+        dirty = True
+
+    # Keep the display alive even when the serial link goes quiet
+    idle_frames += 1
+    if idle_frames >= IDLE_REDRAW_FRAMES:
+        dirty = True
+
+    if not dirty:
+        continue
+    dirty = False
+    idle_frames = 0
+
+    # Reset to the pre-rendered static grid and status bar
+    radar_surface.blit(radar_bg, (0, 0))
+
+    # Draw line, object, text on radar_surface
+    rects = draw_line(radar_surface)
+    rects += draw_object(radar_surface)
+    rects += draw_text(radar_surface)
+
+    if partial_updates:
+        # Only what changed, including last frame's rects so the previous
+        # sweep line and object get erased
+        update_rects = merge_rects(prev_rects + rects)
+        prev_rects = rects
+        if sum(r.w * r.h for r in update_rects) > PARTIAL_UPDATE_MAX_AREA:
+            full_redraw = True
+
+    if full_redraw or not partial_updates:
+        screen.blit(radar_surface, (0, 0))
+        pygame.display.flip()
+        full_redraw = False
+    else:
+        screen.blits([(radar_surface, r, r) for r in update_rects], doreturn=False)
+        pygame.display.update(update_rects)
 
 # Cleanup
 if ser is not None and ser.is_open: